@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import time
 import uuid
 
 import httpx
@@ -16,11 +18,20 @@ from app.api.schemas import (
     SourceDoc,
     StatusResponse,
 )
+from app.config import settings
+from app.db.weaviate_client import weaviate_manager
 
 _SESSION_COOKIE = "sid"
 _SESSION_MAX_AGE = 90 * 24 * 3600  # 90 days
-from app.config import settings
-from app.db.weaviate_client import weaviate_manager
+
+# Collection stats only change on ingest — serve them from memory for 30s, and
+# refresh immediately once the pipeline reports a newer run
+_STATUS_CACHE_TTL = 30.0
+_status_cache: dict = {"ts": 0.0, "last_run": None, "exists": False, "total": 0}
+
+# Load-balancer probes hit /health constantly; re-check Weaviate at most every 5s
+_HEALTH_CACHE_TTL = 5.0
+_health_cache: dict = {"ts": 0.0, "healthy": False}
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +40,10 @@ router = APIRouter()
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(body: ChatRequest, request: Request, response: Response) -> ChatResponse:
+    # Clients that accept SSE get tokens as they're generated (same stream as /chat/stream)
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return await chat_stream_endpoint(body, request, response)
+
     session_id = request.cookies.get(_SESSION_COOKIE) or str(uuid.uuid4())
     response.set_cookie(
         key=_SESSION_COOKIE,
@@ -52,7 +67,7 @@ async def chat_endpoint(body: ChatRequest, request: Request, response: Response)
         SourceDoc(
             title=doc.title,
             url=doc.url,
-            published=str(doc.published) if doc.published else None,
+            published=doc.published,
             source=doc.source,
             score=doc.score,
         )
@@ -154,8 +169,12 @@ async def feedback_endpoint(body: FeedbackRequest) -> None:
 
 
 @router.get("/health", response_model=HealthResponse)
-def health_endpoint() -> HealthResponse:
-    if weaviate_manager.is_healthy():
+async def health_endpoint() -> HealthResponse:
+    now = time.monotonic()
+    if now - _health_cache["ts"] >= _HEALTH_CACHE_TTL:
+        healthy = await asyncio.to_thread(weaviate_manager.is_healthy)
+        _health_cache.update(ts=now, healthy=healthy)
+    if _health_cache["healthy"]:
         return HealthResponse(status="healthy")
     return HealthResponse(status="degraded")
 
@@ -170,14 +189,29 @@ def status_endpoint(request: Request) -> StatusResponse:
     total_objects = 0
 
     if connected:
-        try:
-            collection_exists = weaviate_manager.client.collections.exists(
-                settings.collection_name
+        now = time.monotonic()
+        fresh = (
+            now - _status_cache["ts"] < _STATUS_CACHE_TTL
+            and _status_cache["last_run"] == pipeline.last_run
+        )
+        if fresh:
+            collection_exists = _status_cache["exists"]
+            total_objects = _status_cache["total"]
+        else:
+            try:
+                collection_exists = weaviate_manager.client.collections.exists(
+                    settings.collection_name
+                )
+                if collection_exists:
+                    total_objects = weaviate_manager.get_total_objects()
+            except Exception:
+                pass
+            _status_cache.update(
+                ts=now,
+                last_run=pipeline.last_run,
+                exists=collection_exists,
+                total=total_objects,
             )
-            if collection_exists:
-                total_objects = weaviate_manager.get_total_objects()
-        except Exception:
-            pass
 
     next_run_time = None
     scheduler_running = False
@@ -7,7 +7,7 @@ from pydantic import BaseModel, Field
 class SourceDoc(BaseModel):
     title: str
     url: str
-    published: Optional[str] = None
+    published: Optional[datetime] = None
     source: str
     score: float
 
@@ -5,6 +5,7 @@ class Settings(BaseSettings):
     # OpenAI
     openai_api_key: str
     openai_model: str = "gpt-4o-mini"
+    llm_temperature: float = 0.9  # 0 also enables the exact-match LLM cache tier
 
     # Weaviate
     weaviate_host: str = "localhost"
@@ -15,6 +16,9 @@ class Settings(BaseSettings):
 
     # Embeddings
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_max_tokens_per_batch: int = 8192
+    embedding_onnx_int8: bool = True  # CPU only; False runs the FP32 PyTorch model
+    embedding_intra_op_threads: int = 1  # ONNX Runtime intra-op threads; 0 = one per core
 
     # Ingestion
     ingest_interval_minutes: int = 30
@@ -23,9 +27,21 @@ class Settings(BaseSettings):
     max_history_turns: int = 5
     max_context_docs: int = 5
 
+    # Semantic query cache for first-turn answers (max entries 0 disables)
+    query_cache_threshold: float = 0.95
+    query_cache_ttl_seconds: int = 600
+    query_cache_max_entries: int = 256
+
+    # Semantic LLM answer cache — Redis (leave blank to disable)
+    redis_url: str = ""
+    semcache_threshold: float = 0.9
+    semcache_ttl_seconds: int = 300
+
     # Live stats — football-data.org (leave blank to disable)
     football_data_api_key: str = ""
     stats_cache_ttl_seconds: int = 600
+    parallel_tool_calls: bool = True
+    max_parallel_tools: int = 4
 
     # Auth (leave blank to disable password protection)
     app_password: str = ""
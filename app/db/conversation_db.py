@@ -135,13 +135,14 @@ class ConversationRepository:
                 SELECT role, content
                 FROM conversations
                 WHERE session_id = $1
-                ORDER BY created_at ASC
+                ORDER BY created_at DESC
                 LIMIT $2
                 """,
                 session_id,
                 limit,
             )
-        return [dict(r) for r in rows]
+        # Newest-first off the (session_id, created_at) index, flipped back to chat order
+        return [dict(r) for r in reversed(rows)]
 
     async def close(self) -> None:
         await self._pool.close()
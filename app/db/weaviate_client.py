@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 
@@ -13,6 +14,8 @@ logger = logging.getLogger(__name__)
 class WeaviateManager:
     def __init__(self) -> None:
         self.client: weaviate.WeaviateClient | None = None
+        # Query path for the chat endpoints; ingestion + admin stay on the sync client
+        self.async_client: weaviate.WeaviateAsyncClient | None = None
 
     def connect(self, retries: int = 10, delay: int = 6) -> None:
         for attempt in range(1, retries + 1):
@@ -46,11 +49,46 @@ class WeaviateManager:
                     time.sleep(delay)
         raise RuntimeError(f"Could not connect to Weaviate after {retries} attempts")
 
+    async def connect_async(self, retries: int = 10, delay: int = 6) -> None:
+        for attempt in range(1, retries + 1):
+            try:
+                if settings.weaviate_secure:
+                    client = weaviate.use_async_with_custom(
+                        http_host=settings.weaviate_host,
+                        http_port=443,
+                        http_secure=True,
+                        grpc_host=settings.weaviate_host,
+                        grpc_port=443,
+                        grpc_secure=True,
+                    )
+                else:
+                    client = weaviate.use_async_with_local(
+                        host=settings.weaviate_host,
+                        port=settings.weaviate_port,
+                        grpc_port=settings.weaviate_grpc_port,
+                    )
+                await client.connect()
+                self.async_client = client
+                logger.info("Async Weaviate client connected")
+                return
+            except Exception as exc:
+                logger.warning(
+                    "Async Weaviate connection attempt %d/%d failed: %s", attempt, retries, exc
+                )
+                if attempt < retries:
+                    await asyncio.sleep(delay)
+        raise RuntimeError(f"Could not connect async Weaviate client after {retries} attempts")
+
     def close(self) -> None:
         if self.client:
             self.client.close()
             logger.info("Weaviate connection closed")
 
+    async def close_async(self) -> None:
+        if self.async_client:
+            await self.async_client.close()
+            logger.info("Async Weaviate connection closed")
+
     def ensure_collection(self) -> None:
         if self.client.collections.exists(settings.collection_name):
             logger.info("Collection '%s' already exists", settings.collection_name)
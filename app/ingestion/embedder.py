@@ -1,27 +1,151 @@
+import functools
 import logging
+import os
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
+import onnxruntime as ort
+import torch
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoModel, AutoTokenizer
 
 logger = logging.getLogger(__name__)
 
+_ONNX_CACHE_DIR = os.path.expanduser("~/.cache/huggingface/onnx")
+_QUANTIZED_FILE = "model_quantized.onnx"
+
 
 class Embedder:
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2") -> None:
+    """Sentence embedder: FP16 PyTorch on GPU, int8 ONNX Runtime on CPU.
+
+    On CPU the model is exported and dynamically quantized on first use and
+    cached under `_ONNX_CACHE_DIR`, so later startups load the int8 graph
+    directly; `onnx_int8=False` runs the FP32 PyTorch model instead (handy
+    for checking quantization drift). Pooling matches sentence-transformers
+    on every path: attention-masked mean + L2 norm.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        max_length: int = 256,
+        max_tokens_per_batch: int = 8192,
+        onnx_int8: bool = True,
+        intra_op_threads: int = 1,
+    ) -> None:
         logger.info("Loading embedding model: %s", model_name)
-        self.model = SentenceTransformer(model_name)
-        self.dimension: int = self.model.get_sentence_embedding_dimension()
-        logger.info("Embedding model loaded (dim=%d)", self.dimension)
-
-    def encode(self, texts: list[str], batch_size: int = 32) -> np.ndarray:
-        return self.model.encode(
-            texts,
-            batch_size=batch_size,
-            normalize_embeddings=True,
-            show_progress_bar=False,
-            convert_to_numpy=True,
+        self.max_length = max_length
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._use_torch = self.device == "cuda" or not onnx_int8
+        if self.device == "cuda":
+            self.model = AutoModel.from_pretrained(model_name, torch_dtype=torch.float16)
+            self.model.to(self.device).eval()
+            backend = "cuda fp16"
+        elif not onnx_int8:
+            self.model = AutoModel.from_pretrained(model_name).eval()
+            backend = "cpu fp32"
+        else:
+            self.model = self._load_quantized(model_name, intra_op_threads)
+            backend = "onnx int8"
+        self.dimension: int = self.model.config.hidden_size
+        # Per-instance memo: the query cache, LLM cache and retriever all embed
+        # the same message within one turn. Callers must not mutate the result.
+        self.encode_query = functools.lru_cache(maxsize=1024)(self._encode_query)
+        logger.info("Embedding model loaded (dim=%d, %s)", self.dimension, backend)
+
+    def _load_quantized(self, model_name: str, intra_op_threads: int) -> ORTModelForFeatureExtraction:
+        save_dir = os.path.join(_ONNX_CACHE_DIR, model_name.replace("/", "__"))
+        if not os.path.exists(os.path.join(save_dir, _QUANTIZED_FILE)):
+            logger.info("Exporting %s to ONNX + int8 (one-off)", model_name)
+            fp32_model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(fp32_model)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=save_dir, quantization_config=qconfig)
+        session_options = ort.SessionOptions()
+        # Cap this when the batch encoder shares cores with the request loop
+        session_options.intra_op_num_threads = intra_op_threads
+        return ORTModelForFeatureExtraction.from_pretrained(
+            save_dir,
+            file_name=_QUANTIZED_FILE,
+            provider="CPUExecutionProvider",
+            session_options=session_options,
+        )
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Embed `texts`, returning float32 rows in input order.
+
+        Texts are tokenized once, sorted by length and packed into batches
+        whose padded size (rows x longest row) stays under
+        `max_tokens_per_batch`, so cost tracks total tokens rather than
+        batch_size x longest text.
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        lengths = np.fromiter((len(ids) for ids in encoded["input_ids"]), dtype=np.int64)
+        order = np.argsort(-lengths, kind="stable")
+
+        out = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for batch in self._token_batches(order, lengths):
+            features = self.tokenizer.pad(
+                {key: [encoded[key][i] for i in batch] for key in encoded.keys()},
+                return_tensors="np",
+            )
+            # Writing through the index list undoes the length sort
+            out[batch] = self._forward(features)
+        return out
+
+    def encode_batch(self, texts: list[str]) -> np.ndarray:
+        """Embed a small set of texts (e.g. a query plus candidates) in one forward pass.
+
+        Skips `encode`'s token-budget packing — for a handful of short texts a
+        single padded batch is cheaper than sorting and splitting.
+        """
+        features = self.tokenizer(
+            texts, truncation=True, max_length=self.max_length, padding=True, return_tensors="np"
         )
+        return self._forward(dict(features))
+
+    def _encode_query(self, query: str) -> list[float]:
+        return self.encode_batch([query])[0].tolist()
+
+    def _token_batches(self, order: np.ndarray, lengths: np.ndarray) -> list[list[int]]:
+        # `order` is longest-first, so the first row of each batch sets its padded width
+        batches: list[list[int]] = []
+        current: list[int] = []
+        width = 0
+        for idx in order.tolist():
+            if current and (len(current) + 1) * width > self.max_tokens_per_batch:
+                batches.append(current)
+                current = []
+            if not current:
+                width = int(lengths[idx])
+            current.append(idx)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _forward(self, features: dict) -> np.ndarray:
+        if self._use_torch:
+            return self._forward_torch(features)
+        hidden = self.model(**features).last_hidden_state
+        return _mean_pool_normalize(hidden, features["attention_mask"])
+
+    def _forward_torch(self, features: dict) -> np.ndarray:
+        inputs = {k: torch.from_numpy(v).to(self.device) for k, v in features.items()}
+        with torch.inference_mode():
+            hidden = self.model(**inputs).last_hidden_state.float()
+            mask = inputs["attention_mask"].unsqueeze(-1).float()
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+        return pooled.cpu().numpy()
+
 
-    def encode_query(self, query: str) -> list[float]:
-        vector = self.encode([query])[0]
-        return vector.tolist()
+def _mean_pool_normalize(hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    mask = attention_mask[..., None].astype(np.float32)
+    pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
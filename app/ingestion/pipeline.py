@@ -1,9 +1,12 @@
 import logging
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
+import numpy as np
 import weaviate.util
+from weaviate.classes.data import DataObject
 
 from app.config import settings
 from app.db.weaviate_client import weaviate_manager
@@ -15,6 +18,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_CHUNK_SIZE = 256  # articles per encode/insert stage
+
 
 class IngestionPipeline:
     def __init__(
@@ -56,23 +61,22 @@ class IngestionPipeline:
                 "duration_seconds": round(time.perf_counter() - start, 2),
             }
 
-        # 3. Build texts to embed: title + summary
-        embed_texts = [f"{a.title}. {a.summary}" for a in new_articles]
-
-        # 4. Embed
-        vectors = self.embedder.encode(embed_texts)
-
-        # 5. Batch upsert to Weaviate
+        # 3-5. Embed (title + summary) and upsert chunk by chunk. Inserts run on a
+        # single background thread, so Weaviate ingests chunk N while chunk N+1
+        # is being encoded; at most one insert is in flight at a time.
+        now_iso = _rfc3339(datetime.now(timezone.utc))
         collection = weaviate_manager.client.collections.get(settings.collection_name)
-        with collection.batch.dynamic() as batch:
-            for article, vector in zip(new_articles, vectors):
-                uuid = weaviate.util.generate_uuid5(article.content_hash)
-                props = self._build_payload(article)
-                batch.add_object(
-                    properties=props,
-                    vector=vector.tolist(),
-                    uuid=uuid,
-                )
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="weaviate-insert") as insert_pool:
+            pending: Future | None = None
+            for offset in range(0, len(new_articles), _CHUNK_SIZE):
+                chunk = new_articles[offset : offset + _CHUNK_SIZE]
+                vectors = self.embedder.encode([f"{a.title}. {a.summary}" for a in chunk])
+                objects = self._build_objects(chunk, vectors, now_iso)
+                if pending is not None:
+                    pending.result()
+                pending = insert_pool.submit(self._insert, collection, objects)
+            if pending is not None:
+                pending.result()
 
         embedded_count = len(new_articles)
         self.last_run = datetime.now(timezone.utc)
@@ -91,15 +95,35 @@ class IngestionPipeline:
             "duration_seconds": round(time.perf_counter() - start, 2),
         }
 
-    def _build_payload(self, article: Article) -> dict:
-        now_iso = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    def _build_objects(
+        self, articles: list[Article], vectors: np.ndarray, now_iso: str
+    ) -> list[DataObject]:
+        # encode() already yields float32, so asarray is a no-copy view; the client
+        # packs each vector from a Python list, so convert the whole matrix once
+        vectors_list = np.asarray(vectors, dtype=np.float32).tolist()
+        return [
+            DataObject(
+                properties=self._build_payload(article, now_iso),
+                vector=vector,
+                uuid=weaviate.util.generate_uuid5(article.content_hash),
+            )
+            for article, vector in zip(articles, vectors_list)
+        ]
 
+    @staticmethod
+    def _insert(collection, objects: list[DataObject]) -> None:
+        result = collection.data.insert_many(objects)
+        if result.has_errors:
+            logger.warning("Weaviate rejected %d objects: %s", len(result.errors), result.errors)
+
+    @staticmethod
+    def _build_payload(article: Article, now_iso: str) -> dict:
         published_iso: str | None = None
         if article.published is not None:
             # Weaviate DATE requires RFC3339 — isoformat() produces +00:00 for UTC,
             # which is valid. For naive datetimes, assume UTC and append Z.
             if article.published.tzinfo is None:
-                published_iso = article.published.strftime("%Y-%m-%dT%H:%M:%SZ")
+                published_iso = _rfc3339(article.published)
             else:
                 published_iso = article.published.isoformat()
 
@@ -112,3 +136,11 @@ class IngestionPipeline:
             "content_hash": article.content_hash,
             "ingested_at": now_iso,
         }
+
+
+def _rfc3339(dt: datetime) -> str:
+    """Format as YYYY-MM-DDTHH:MM:SSZ — same output as strftime, without the format parsing."""
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
+    )
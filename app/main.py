@@ -1,12 +1,14 @@
 import asyncio
+import functools
 import hashlib
+import hmac
 import logging
 from contextlib import asynccontextmanager
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from fastapi import FastAPI, Form, Request
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.api.routes import router
@@ -15,10 +17,12 @@ from app.db.conversation_db import ConversationRepository, init_db
 from app.db.weaviate_client import weaviate_manager
 from app.ingestion.embedder import Embedder
 from app.ingestion.pipeline import IngestionPipeline
-from app.ingestion.rss_fetcher import RSSFetcher
+from app.ingestion.rss_fetcher import RSSFetcher, build_feed_client
 from app.rag.agent_tools import ToolDispatcher
 from app.rag.chat_engine import ChatEngine
+from app.rag.llm_cache import SemanticLLMCache
 from app.rag.llm_client import LLMClient
+from app.rag.query_cache import QueryCache
 from app.rag.retriever import Retriever
 from app.stats.football_data_client import FootballDataClient
 from app.utils.deduplication import DeduplicationStore
@@ -107,7 +111,9 @@ _LOGIN_HTML = """<!DOCTYPE html>
 </html>"""
 
 
+@functools.cache
 def _auth_token() -> str:
+    # settings are fixed for the process lifetime, so hash the password once
     return hashlib.sha256(f"phil:{settings.app_password}".encode()).hexdigest()
 
 
@@ -136,16 +142,25 @@ async def lifespan(app: FastAPI):
     # 2. Connect to Weaviate and ensure collection + schema exist
     weaviate_manager.connect()
     weaviate_manager.ensure_collection()
+    await weaviate_manager.connect_async()
 
     # 3. Initialize shared components
-    embedder = Embedder(settings.embedding_model)
+    embedder = Embedder(
+        settings.embedding_model,
+        max_tokens_per_batch=settings.embedding_max_tokens_per_batch,
+        onnx_int8=settings.embedding_onnx_int8,
+        intra_op_threads=settings.embedding_intra_op_threads,
+    )
+    # Dummy batch so ORT picks its kernels / spins up its thread pool before the first request
+    embedder.encode(["warmup"] * 8)
     dedup_store = DeduplicationStore()
 
     # 4. Warm the deduplication cache from existing Weaviate data
     dedup_store.warm_cache()
 
     # 5. Build the ingestion pipeline
-    fetcher = RSSFetcher()
+    feed_client = build_feed_client()
+    fetcher = RSSFetcher(http_client=feed_client, loop=asyncio.get_running_loop())
     pipeline = IngestionPipeline(fetcher=fetcher, embedder=embedder, dedup_store=dedup_store)
 
     # 6. Build the RAG chain
@@ -162,17 +177,40 @@ async def lifespan(app: FastAPI):
     tool_dispatcher = ToolDispatcher(stats_client) if stats_client else None
     if tool_dispatcher:
         logger.info("Agentic tools enabled (football-data.org, cache TTL %ds)", settings.stats_cache_ttl_seconds)
-    chat_engine = ChatEngine(retriever=retriever, llm_client=llm_client, tool_dispatcher=tool_dispatcher, conv_repo=conv_repo)
+    query_cache = QueryCache(
+        threshold=settings.query_cache_threshold,
+        ttl_seconds=settings.query_cache_ttl_seconds,
+        max_entries=settings.query_cache_max_entries,
+    )
+    llm_cache = (
+        SemanticLLMCache(
+            settings.redis_url,
+            threshold=settings.semcache_threshold,
+            ttl_seconds=settings.semcache_ttl_seconds,
+        )
+        if settings.redis_url
+        else None
+    )
+    if llm_cache:
+        logger.info("Semantic LLM cache enabled (Redis, TTL %ds)", settings.semcache_ttl_seconds)
+    chat_engine = ChatEngine(
+        retriever=retriever,
+        llm_client=llm_client,
+        tool_dispatcher=tool_dispatcher,
+        conv_repo=conv_repo,
+        query_cache=query_cache,
+        llm_cache=llm_cache,
+    )
 
     # 7. Attach to app.state for route handlers
     app.state.pipeline = pipeline
     app.state.chat_engine = chat_engine
     app.state.conv_repo = conv_repo
+    app.state.http_client = feed_client
 
     # 8. Seed the database on startup (run in thread pool so the event loop stays free)
     logger.info("Seeding database with latest EPL news...")
-    loop = asyncio.get_event_loop()
-    seed_stats = await loop.run_in_executor(None, pipeline.run)
+    seed_stats = await asyncio.to_thread(pipeline.run)
     logger.info(
         "Seed complete: fetched=%d embedded=%d skipped=%d (%.1fs)",
         seed_stats["articles_fetched"],
@@ -208,14 +246,23 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down...")
     scheduler.shutdown(wait=False)
     await llm_client.close()
+    await feed_client.aclose()
     if stats_client:
         await stats_client.close()
+    if llm_cache:
+        await llm_cache.close()
     await conv_repo.close()
+    await weaviate_manager.close_async()
     weaviate_manager.close()
     logger.info("Shutdown complete.")
 
 
-app = FastAPI(title="EPL Insider", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="EPL Insider",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 
 @app.middleware("http")
@@ -225,7 +272,8 @@ async def auth_middleware(request: Request, call_next):
     # Always allow health check and login routes
     if request.url.path in ("/health", "/login"):
         return await call_next(request)
-    if request.cookies.get("auth") == _auth_token():
+    # Compare as bytes — compare_digest raises on non-ASCII str input
+    if hmac.compare_digest(request.cookies.get("auth", "").encode(), _auth_token().encode()):
         return await call_next(request)
     return RedirectResponse("/login")
 
@@ -5,14 +5,15 @@ handles the schema declarations and routes each tool_call to the correct
 FootballDataClient method.
 """
 
-import json
 import logging
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 # ── Tool schemas passed to OpenAI chat completions ────────────────────────────
 
-AGENT_TOOLS: list[dict] = [
+AGENT_TOOLS: tuple[dict, ...] = (
     {
         "type": "function",
         "function": {
@@ -87,7 +88,10 @@ AGENT_TOOLS: list[dict] = [
             },
         },
     },
-]
+)
+
+# Encoded once — orjson splices the Fragment into every request body verbatim
+AGENT_TOOLS_JSON = orjson.Fragment(orjson.dumps(AGENT_TOOLS))
 
 
 # ── Dispatcher ────────────────────────────────────────────────────────────────
@@ -97,37 +101,33 @@ class ToolDispatcher:
 
     def __init__(self, stats_client) -> None:
         self._client = stats_client
+        # tool name → (client method, ((arg name, coercer, default), ...)), built once
+        self._handlers = {
+            "get_standings": (stats_client.get_standings, ()),
+            "get_top_scorers": (stats_client.get_top_scorers, (("limit", int, 10),)),
+            "get_recent_results": (stats_client.get_recent_results, (("days", int, 14),)),
+            "get_upcoming_fixtures": (stats_client.get_upcoming_fixtures, (("days", int, 21),)),
+        }
 
     async def dispatch(self, tool_call: dict) -> str:
         """Execute a single tool call and return the result as a string."""
         name = tool_call["function"]["name"]
         try:
-            args: dict = json.loads(tool_call["function"].get("arguments") or "{}")
-        except (json.JSONDecodeError, KeyError):
+            args: dict = orjson.loads(tool_call["function"].get("arguments") or "{}")
+        except (orjson.JSONDecodeError, KeyError):
             args = {}
 
         logger.info("Tool call: %s(%s)", name, args)
 
-        try:
-            if name == "get_standings":
-                return await self._client.get_standings()
-
-            elif name == "get_top_scorers":
-                limit = int(args.get("limit", 10))
-                return await self._client.get_top_scorers(limit=limit)
-
-            elif name == "get_recent_results":
-                days = int(args.get("days", 14))
-                return await self._client.get_recent_results(days=days)
-
-            elif name == "get_upcoming_fixtures":
-                days = int(args.get("days", 21))
-                return await self._client.get_upcoming_fixtures(days=days)
-
-            else:
-                logger.warning("Unknown tool called: %s", name)
-                return f"Unknown tool: {name}"
+        entry = self._handlers.get(name)
+        if entry is None:
+            logger.warning("Unknown tool called: %s", name)
+            return f"Unknown tool: {name}"
+        handler, spec = entry
 
+        try:
+            kwargs = {arg: coerce(args.get(arg, default)) for arg, coerce, default in spec}
+            return await handler(**kwargs)
         except Exception as exc:
             logger.error("Tool %s failed: %s", name, exc)
             return f"Could not fetch data for {name}: {exc}"
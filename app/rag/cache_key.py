@@ -0,0 +1,24 @@
+"""Canonical cache keys over LLM requests.
+
+orjson with OPT_SORT_KEYS gives a byte-stable encoding of logically equal
+dicts, and SHA-256 over that is the key — safe to share across workers and
+to use as a Redis key suffix.
+"""
+
+import hashlib
+
+import orjson
+
+
+def canonical_hash(obj) -> str:
+    return hashlib.sha256(orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def llm_key(model: str, messages: list[dict], tools=None, sampling: dict | None = None) -> str:
+    """Exact-match key for a chat completions request.
+
+    `tools` may be a list of schemas or a pre-encoded orjson.Fragment.
+    `sampling` holds the sampling parameters (temperature, max_tokens), so an
+    answer is never replayed for a request generated under different ones.
+    """
+    return canonical_hash({"m": model, "msg": messages, "t": tools, "s": sampling})
@@ -1,7 +1,6 @@
 import asyncio
 import json
 import logging
-import re
 from typing import AsyncGenerator
 
 from opentelemetry import trace
@@ -9,8 +8,11 @@ from openinference.semconv.trace import SpanAttributes
 
 from app.config import settings
 from app.db.conversation_db import ConversationRepository
-from app.rag.agent_tools import AGENT_TOOLS, ToolDispatcher
-from app.rag.llm_client import LLMClient
+from app.rag.agent_tools import AGENT_TOOLS_JSON, ToolDispatcher
+from app.rag.cache_key import llm_key
+from app.rag.llm_cache import SemanticLLMCache
+from app.rag.llm_client import DEFAULT_MAX_TOKENS, LLMClient
+from app.rag.query_cache import QueryCache
 from app.rag.retriever import Retriever, SourceDoc
 
 logger = logging.getLogger(__name__)
@@ -35,11 +37,21 @@ What you know:
 Hard rules:
 - Never say "context", "articles", "based on", "provided information", or anything that sounds like a search engine or a robot.
 - If you don't know something recent and you don't have a tool for it, just say "not sure on that one mate, might want to check the latest" — keep it natural.
-- This is football, not a board meeting. Keep it fun.\
+- This is football, not a board meeting. Keep it fun.
+
+Citing news:
+- When a message comes with numbered news articles, after your reply, on its own line write: SOURCES: followed by the numbers \
+of any articles you actually used (e.g. SOURCES:1,3), or just SOURCES: with nothing after it if you used none.\
 """
 
+# Shared by every request — the same object heads every message list
+_SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_PROMPT}
+
 _MAX_TOOL_ITERATIONS = 5
 
+# Footer labels accepted before the colon, covering common LLM typos
+_FOOTER_LABELS = frozenset({"SOURCE", "SOURCES", "SOURCESS"})
+
 
 class ChatEngine:
     def __init__(
@@ -48,11 +60,19 @@ class ChatEngine:
         llm_client: LLMClient,
         tool_dispatcher: ToolDispatcher | None = None,
         conv_repo: ConversationRepository | None = None,
+        query_cache: QueryCache | None = None,
+        llm_cache: SemanticLLMCache | None = None,
     ) -> None:
         self.retriever = retriever
         self.llm = llm_client
         self.tool_dispatcher = tool_dispatcher
         self.conv_repo = conv_repo
+        self.query_cache = query_cache
+        self.llm_cache = llm_cache
+        # Caps concurrent football-data.org calls (free tier is 10 req/min)
+        self._tool_semaphore = asyncio.Semaphore(
+            settings.max_parallel_tools if settings.parallel_tool_calls else 1
+        )
 
     async def chat(self, session_id: str, message: str) -> dict:
         with tracer.start_as_current_span("epl-insider.chat") as span:
@@ -60,17 +80,31 @@ class ChatEngine:
             span.set_attribute(SpanAttributes.SESSION_ID, session_id)
             span.set_attribute(SpanAttributes.INPUT_VALUE, message)
 
-            # 1. Save user turn upfront so tool_calls / retrieval can reference it
+            # 0. Conversation history — read before this turn is saved so the
+            #    current message isn't duplicated in the prompt. Also tells the
+            #    semantic cache whether this is the session's first turn.
+            history: list[dict] = []
+            if self.conv_repo:
+                history = await self.conv_repo.get_history(session_id, max_turns=settings.max_history_turns)
+
+            # 1. Semantic cache — a near-identical opening question skips the whole chain
+            query_vector, cached = await self._cached_first_turn(session_id, message, history)
+            span.set_attribute("query_cache_hit", cached is not None)
+            if cached:
+                span.set_attribute(SpanAttributes.OUTPUT_VALUE, cached["answer"])
+                return cached
+
+            # 2. Save user turn upfront so tool_calls / retrieval can reference it
             user_turn_id: str | None = None
             if self.conv_repo:
                 user_turn_id = await self.conv_repo.save_turn(session_id, "user", message)
 
-            # 2. Retrieve relevant news context (RAG)
+            # 3. Retrieve relevant news context (RAG)
             with tracer.start_as_current_span("epl-insider.retrieval") as retrieval_span:
                 retrieval_span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "RETRIEVER")
                 retrieval_span.set_attribute(SpanAttributes.INPUT_VALUE, message)
-                context, sources = await asyncio.get_event_loop().run_in_executor(
-                    None, self.retriever.search_with_context, message, settings.max_context_docs
+                context, sources = await self.retriever.search_with_context(
+                    message, settings.max_context_docs
                 )
                 for i, src in enumerate(sources):
                     retrieval_span.set_attribute(f"retrieved_doc.{i}.title", src.title)
@@ -84,55 +118,43 @@ class ChatEngine:
                     [{"title": s.title, "url": s.url, "source": s.source, "score": s.score} for s in sources],
                 )
 
-            # 3. Get conversation history
-            history: list[dict] = []
-            if self.conv_repo:
-                history = await self.conv_repo.get_history(session_id, max_turns=settings.max_history_turns)
-
             # 4. Build initial messages
             messages = self._build_messages(message, context, history)
 
-            # 5. Agentic loop — the LLM can call tools before giving its final answer
-            tools = AGENT_TOOLS if self.tool_dispatcher else []
-            raw_answer = ""
-
-            for iteration in range(_MAX_TOOL_ITERATIONS):
-                with tracer.start_as_current_span("epl-insider.llm") as llm_span:
-                    llm_span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "LLM")
-                    llm_span.set_attribute("iteration", iteration)
-                    msg, finish_reason = await self.llm.complete(messages, tools=tools or None)
-                messages.append(msg)
-
-                if finish_reason == "tool_calls":
-                    tool_calls = msg.get("tool_calls") or []
-                    if not tool_calls:
+            # 5. Agentic loop — the LLM can call tools before giving its final answer.
+            #    Skipped when the semantic LLM cache has an answer for this question + context.
+            cache_slot, raw_answer = await self._lookup_llm_cache(message, context, messages)
+            span.set_attribute("llm_cache_hit", raw_answer is not None)
+            used_tools = False
+            if raw_answer is None:
+                tools = AGENT_TOOLS_JSON if self.tool_dispatcher else None
+                raw_answer = ""
+
+                for iteration in range(_MAX_TOOL_ITERATIONS):
+                    with tracer.start_as_current_span("epl-insider.llm") as llm_span:
+                        llm_span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "LLM")
+                        llm_span.set_attribute("iteration", iteration)
+                        msg, finish_reason = await self.llm.complete(messages, tools=tools)
+                    messages.append(msg)
+
+                    if finish_reason == "tool_calls":
+                        tool_calls = msg.get("tool_calls") or []
+                        if not tool_calls:
+                            break
+
+                        used_tools = True
+                        messages.extend(await self._run_tool_calls(tool_calls, user_turn_id))
+
+                        logger.debug("Tool iteration %d/%d complete", iteration + 1, _MAX_TOOL_ITERATIONS)
+
+                    else:
+                        # finish_reason == "stop" (or "length") — we have the final answer
+                        raw_answer = (msg.get("content") or "").strip()
                         break
 
-                    # Execute all tool calls (may be parallel in theory, but free-tier
-                    # football-data.org is rate-limited so we run sequentially)
-                    for tc in tool_calls:
-                        tool_name = tc.get("function", {}).get("name", "unknown")
-                        tc_input = tc.get("function", {}).get("arguments", "")
-                        with tracer.start_as_current_span("epl-insider.tool") as tool_span:
-                            tool_span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "TOOL")
-                            tool_span.set_attribute(SpanAttributes.TOOL_NAME, tool_name)
-                            tool_span.set_attribute(SpanAttributes.INPUT_VALUE, tc_input)
-                            result = await self.tool_dispatcher.dispatch(tc)
-                            tool_span.set_attribute(SpanAttributes.OUTPUT_VALUE, result)
-                        if self.conv_repo and user_turn_id:
-                            await self.conv_repo.save_tool_call(user_turn_id, tool_name, tc_input, result)
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tc["id"],
-                            "content": result,
-                        })
-
-                    logger.debug("Tool iteration %d/%d complete", iteration + 1, _MAX_TOOL_ITERATIONS)
-
-                else:
-                    # finish_reason == "stop" (or "length") — we have the final answer
-                    raw_answer = (msg.get("content") or "").strip()
-                    break
+                # Answers built on live tool output aren't reusable — only cache tool-free ones
+                if cache_slot and raw_answer and not used_tools:
+                    await self.llm_cache.store(*cache_slot, raw_answer)
 
             # 6. Strip the SOURCES footer and map cited articles
             answer, used_sources = _parse_sources_footer(raw_answer, sources)
@@ -143,11 +165,15 @@ class ChatEngine:
 
             span.set_attribute(SpanAttributes.OUTPUT_VALUE, answer)
 
-            return {
+            result = {
                 "answer": answer,
                 "sources": used_sources,
                 "retrieved_doc_count": len(sources),
             }
+            # Same rule as the LLM cache: live tool output and empty answers aren't reusable
+            if query_vector is not None and answer and not used_tools:
+                self.query_cache.store(query_vector, result)
+            return result
 
     async def chat_stream(self, session_id: str, message: str) -> AsyncGenerator[str, None]:
         """Async generator that yields SSE strings for a streaming response.
@@ -160,17 +186,33 @@ class ChatEngine:
             span.set_attribute(SpanAttributes.SESSION_ID, session_id)
             span.set_attribute(SpanAttributes.INPUT_VALUE, message)
 
-            # 1. Save user turn upfront
+            # 0. Conversation history — read before this turn is saved so the
+            #    current message isn't duplicated in the prompt. Also tells the
+            #    semantic cache whether this is the session's first turn.
+            history: list[dict] = []
+            if self.conv_repo:
+                history = await self.conv_repo.get_history(session_id, max_turns=settings.max_history_turns)
+
+            # 1. Semantic cache — replay a cached answer as a single token + done event
+            query_vector, cached = await self._cached_first_turn(session_id, message, history)
+            span.set_attribute("query_cache_hit", cached is not None)
+            if cached:
+                span.set_attribute(SpanAttributes.OUTPUT_VALUE, cached["answer"])
+                yield f"data: {json.dumps({'type': 'token', 'text': cached['answer']})}\n\n"
+                yield _done_event(cached["answer"], cached["sources"], session_id)
+                return
+
+            # 2. Save user turn upfront
             user_turn_id: str | None = None
             if self.conv_repo:
                 user_turn_id = await self.conv_repo.save_turn(session_id, "user", message)
 
-            # 2. Retrieve relevant news context
+            # 3. Retrieve relevant news context
             with tracer.start_as_current_span("epl-insider.retrieval") as retrieval_span:
                 retrieval_span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "RETRIEVER")
                 retrieval_span.set_attribute(SpanAttributes.INPUT_VALUE, message)
-                context, sources = await asyncio.get_event_loop().run_in_executor(
-                    None, self.retriever.search_with_context, message, settings.max_context_docs
+                context, sources = await self.retriever.search_with_context(
+                    message, settings.max_context_docs
                 )
                 for i, src in enumerate(sources):
                     retrieval_span.set_attribute(f"retrieved_doc.{i}.title", src.title)
@@ -184,44 +226,48 @@ class ChatEngine:
                     [{"title": s.title, "url": s.url, "source": s.source, "score": s.score} for s in sources],
                 )
 
-            # 3. Conversation history
-            history: list[dict] = []
-            if self.conv_repo:
-                history = await self.conv_repo.get_history(session_id, max_turns=settings.max_history_turns)
-
             # 4. Build messages
             messages = self._build_messages(message, context, history)
 
-            # 5. Tool iterations (non-streaming) — resolve any tool calls before streaming
-            tools = AGENT_TOOLS if self.tool_dispatcher else []
-            for iteration in range(_MAX_TOOL_ITERATIONS):
-                msg, finish_reason = await self.llm.complete(messages, tools=tools or None)
-
-                if finish_reason != "tool_calls":
-                    # LLM skipped tools — discard this non-streamed answer and re-generate
-                    # below with streaming so the user gets the token-by-token experience
-                    break
-
-                messages.append(msg)
-                tool_calls = msg.get("tool_calls") or []
-                for tc in tool_calls:
-                    tool_name = tc.get("function", {}).get("name", "unknown")
-                    tc_input = tc.get("function", {}).get("arguments", "")
-                    with tracer.start_as_current_span("epl-insider.tool") as tool_span:
-                        tool_span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "TOOL")
-                        tool_span.set_attribute(SpanAttributes.TOOL_NAME, tool_name)
-                        tool_span.set_attribute(SpanAttributes.INPUT_VALUE, tc_input)
-                        result = await self.tool_dispatcher.dispatch(tc)
-                        tool_span.set_attribute(SpanAttributes.OUTPUT_VALUE, result)
-                    if self.conv_repo and user_turn_id:
-                        await self.conv_repo.save_tool_call(user_turn_id, tool_name, tc_input, result)
-                    messages.append({"role": "tool", "tool_call_id": tc["id"], "content": result})
+            # 5. Tool iterations (non-streaming) — resolve any tool calls before streaming.
+            #    A semantic LLM cache hit skips straight to replaying the cached answer.
+            cache_slot, cached_answer = await self._lookup_llm_cache(message, context, messages)
+            span.set_attribute("llm_cache_hit", cached_answer is not None)
+            used_tools = False
+            if cached_answer is None:
+                tools = AGENT_TOOLS_JSON if self.tool_dispatcher else None
+                for iteration in range(_MAX_TOOL_ITERATIONS):
+                    msg, finish_reason = await self.llm.complete(messages, tools=tools)
+
+                    if finish_reason != "tool_calls":
+                        # LLM skipped tools — discard this non-streamed answer and re-generate
+                        # below with streaming so the user gets the token-by-token experience
+                        break
+
+                    messages.append(msg)
+                    tool_calls = msg.get("tool_calls") or []
+                    used_tools = used_tools or bool(tool_calls)
+                    messages.extend(await self._run_tool_calls(tool_calls, user_turn_id))
 
             # 6. Stream the final answer
-            raw_answer = ""
-            async for chunk in self.llm.stream_complete(messages):
-                raw_answer += chunk
-                yield f"data: {json.dumps({'type': 'token', 'text': chunk})}\n\n"
+            if cached_answer is not None:
+                raw_answer = cached_answer
+                yield f"data: {json.dumps({'type': 'token', 'text': raw_answer[: _footer_start(raw_answer)]})}\n\n"
+            else:
+                raw_answer = ""
+                emitted = 0  # chars of raw_answer already sent as token events
+                async for chunk in self.llm.stream_complete(messages):
+                    raw_answer += chunk
+                    # Hold back a trailing line that may turn out to be the SOURCES footer
+                    safe = _stream_safe_len(raw_answer)
+                    if safe > emitted:
+                        yield f"data: {json.dumps({'type': 'token', 'text': raw_answer[emitted:safe]})}\n\n"
+                        emitted = safe
+                end = _footer_start(raw_answer)
+                if end > emitted:
+                    yield f"data: {json.dumps({'type': 'token', 'text': raw_answer[emitted:end]})}\n\n"
+                if cache_slot and raw_answer.strip() and not used_tools:
+                    await self.llm_cache.store(*cache_slot, raw_answer)
 
             # 7. Strip SOURCES footer and map cited articles
             answer, used_sources = _parse_sources_footer(raw_answer, sources)
@@ -232,18 +278,103 @@ class ChatEngine:
 
             span.set_attribute(SpanAttributes.OUTPUT_VALUE, answer)
 
+            if query_vector is not None and answer and not used_tools:
+                self.query_cache.store(
+                    query_vector,
+                    {"answer": answer, "sources": used_sources, "retrieved_doc_count": len(sources)},
+                )
+
             # 9. Send done event with clean answer + sources
-            sources_payload = [
-                {
-                    "title": s.title,
-                    "url": s.url,
-                    "published": str(s.published) if s.published else None,
-                    "source": s.source,
-                    "score": s.score,
-                }
-                for s in used_sources
-            ]
-            yield f"data: {json.dumps({'type': 'done', 'answer': answer, 'sources': sources_payload, 'session_id': session_id})}\n\n"
+            yield _done_event(answer, used_sources, session_id)
+
+    async def _run_tool_calls(
+        self, tool_calls: list[dict], user_turn_id: str | None
+    ) -> list[dict]:
+        """Dispatch one assistant message's tool calls concurrently.
+
+        Returns the tool messages in the order the calls were emitted, which
+        the OpenAI API requires. A failed call becomes an error string so the
+        rest of the turn still goes ahead; a cancelled one cancels the turn.
+        """
+        results = await asyncio.gather(
+            *(self._dispatch_tool(tc) for tc in tool_calls),
+            return_exceptions=True,
+        )
+
+        tool_messages: list[dict] = []
+        for tc, result in zip(tool_calls, results):
+            tool_name = tc.get("function", {}).get("name", "unknown")
+            tc_input = tc.get("function", {}).get("arguments", "")
+            # CancelledError is a BaseException — propagate it rather than send it to the model
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, Exception):
+                logger.error("Tool %s failed: %s", tool_name, result)
+                result = f"Could not fetch data for {tool_name}: {result}"
+            if self.conv_repo and user_turn_id:
+                await self.conv_repo.save_tool_call(user_turn_id, tool_name, tc_input, result)
+            tool_messages.append({"role": "tool", "tool_call_id": tc["id"], "content": result})
+        return tool_messages
+
+    async def _dispatch_tool(self, tc: dict) -> str:
+        async with self._tool_semaphore:
+            with tracer.start_as_current_span("epl-insider.tool") as tool_span:
+                tool_span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "TOOL")
+                tool_span.set_attribute(SpanAttributes.TOOL_NAME, tc.get("function", {}).get("name", "unknown"))
+                tool_span.set_attribute(SpanAttributes.INPUT_VALUE, tc.get("function", {}).get("arguments", ""))
+                result = await self.tool_dispatcher.dispatch(tc)
+                tool_span.set_attribute(SpanAttributes.OUTPUT_VALUE, result)
+        return result
+
+    async def _lookup_llm_cache(
+        self, message: str, context: str, messages: list[dict]
+    ) -> tuple[tuple[str | None, list[float], str] | None, str | None]:
+        """Return (cache_slot, cached_raw_answer).
+
+        The exact tier is checked first and needs no embedding, but only at
+        temperature 0 — above that a stored completion is one random sample,
+        not the answer to the request. cache_slot is the (request_key,
+        query_vector, context_hash) triple to hand back to `llm_cache.store`
+        on a miss (request_key is None when the exact tier is off); it is None
+        when the cache is disabled or on an exact hit.
+        """
+        if self.llm_cache is None:
+            return None, None
+        request_key: str | None = None
+        if settings.llm_temperature == 0:
+            tools = AGENT_TOOLS_JSON if self.tool_dispatcher else None
+            sampling = {"temperature": settings.llm_temperature, "max_tokens": DEFAULT_MAX_TOKENS}
+            request_key = llm_key(settings.openai_model, messages, tools, sampling)
+            cached = await self.llm_cache.lookup_exact(request_key)
+            if cached is not None:
+                return None, cached
+
+        query_vector = await asyncio.to_thread(self.retriever.embedder.encode_query, message)
+        # Everything but the final user turn, plus the news context folded into it
+        context_hash = SemanticLLMCache.context_hash(messages[:-1], context)
+        cached = await self.llm_cache.lookup(query_vector, context_hash)
+        return (request_key, query_vector, context_hash), cached
+
+    async def _cached_first_turn(
+        self, session_id: str, message: str, history: list[dict]
+    ) -> tuple[list[float] | None, dict | None]:
+        """Look up `message` in the query cache if this is the session's first turn.
+
+        `history` is the turn's already-fetched history. Returns (query_vector,
+        cached_result). query_vector is None when the turn is not cacheable
+        (cache disabled, or prior history would make a shared answer wrong).
+        On a hit both turns are persisted so history stays consistent with
+        what the user saw.
+        """
+        if self.query_cache is None or history:
+            return None, None
+
+        query_vector = await asyncio.to_thread(self.retriever.embedder.encode_query, message)
+        cached = self.query_cache.lookup(query_vector)
+        if cached and self.conv_repo:
+            await self.conv_repo.save_turn(session_id, "user", message)
+            await self.conv_repo.save_turn(session_id, "assistant", cached["answer"])
+        return query_vector, cached
 
     def _build_messages(
         self,
@@ -251,47 +382,78 @@ class ChatEngine:
         context: str,
         history: list[dict],
     ) -> list[dict]:
-        messages: list[dict] = [{"role": "system", "content": _SYSTEM_PROMPT}]
-
-        # Inject prior conversation turns
-        for turn in history:
-            messages.append({"role": turn["role"], "content": turn["content"]})
-
         # Build user content: news context + question
         user_parts: list[str] = []
         if context:
-            user_parts.append(
-                f"Here's the latest news that might be relevant:\n---\n{context}\n---\n\n"
-                f"After your reply, on its own line write: SOURCES: followed by the numbers "
-                f"of any articles above you actually used (e.g. SOURCES:1,3), or just SOURCES: with nothing after it if you used none."
-            )
+            user_parts.append(f"Here's the latest news that might be relevant:\n---\n{context}\n---")
         user_parts.append(message)
 
-        messages.append({"role": "user", "content": "\n\n".join(user_parts)})
-        return messages
+        # Static system prompt first, dynamic content last — keeps the prefix
+        # byte-identical across sessions so OpenAI's automatic prompt caching hits
+        # History rows are already {"role", "content"} dicts, so they're spliced in as-is
+        return [_SYSTEM_MESSAGE, *history, {"role": "user", "content": "\n\n".join(user_parts)}]
 
 
-def _parse_sources_footer(raw: str, all_sources: list) -> tuple[str, list]:
-    """Strip the SOURCES: line appended by the LLM and return (clean_answer, used_sources).
+def _done_event(answer: str, sources: list[SourceDoc], session_id: str) -> str:
+    sources_payload = [
+        {
+            "title": s.title,
+            "url": s.url,
+            "published": s.published.isoformat() if s.published else None,
+            "source": s.source,
+            "score": s.score,
+        }
+        for s in sources
+    ]
+    return f"data: {json.dumps({'type': 'done', 'answer': answer, 'sources': sources_payload, 'session_id': session_id})}\n\n"
+
+
+def _is_footer_line(line: str) -> bool:
+    label, colon, _ = line.partition(":")
+    return bool(colon) and label.upper() in _FOOTER_LABELS
+
+
+def _footer_start(raw: str) -> int:
+    """Index of the newline that opens a final SOURCES line, or len(raw) if there is none."""
+    nl = raw.rstrip().rfind("\n")
+    if nl >= 0 and _is_footer_line(raw.rstrip()[nl + 1 :]):
+        return nl
+    return len(raw)
+
 
-    The regex accepts minor LLM typo variants (SOURCESS, SOURCE, SOURCES, etc.)
-    so the footer never leaks into the displayed answer.
+def _stream_safe_len(raw: str) -> int:
+    """How much of a partial answer can be streamed without leaking the footer.
+
+    The footer is always preceded by a newline, so only the text after the
+    last newline is ever held — and only while it still reads like the start
+    of a SOURCES line.
     """
-    match = re.search(r"\nSOURCES?S?:\s*(.*?)\s*$", raw.rstrip(), re.IGNORECASE)
-    if not match:
-        return raw.strip(), []
+    tail = raw.rstrip()
+    nl = tail.rfind("\n")
+    if nl < 0:
+        return len(raw)
+    line = tail[nl + 1 :]
+    if _is_footer_line(line) or "SOURCESS".startswith(line.upper()):
+        return nl
+    return len(raw)
 
-    clean = raw[: match.start()].strip()
-    indices_str = match.group(1).strip()
 
-    if not indices_str:
-        return clean, []
+def _parse_sources_footer(raw: str, all_sources: list) -> tuple[str, list]:
+    """Strip the SOURCES: line appended by the LLM and return (clean_answer, used_sources).
 
-    used: list = []
-    for part in re.split(r"[,\s]+", indices_str):
-        if part.isdigit():
-            idx = int(part) - 1  # convert 1-based → 0-based
-            if 0 <= idx < len(all_sources):
-                used.append(all_sources[idx])
+    The footer is always the final line, so only that line is inspected —
+    work is bounded by the footer, not the answer length. Minor LLM typo
+    variants (SOURCESS, SOURCE, any case) are accepted so the footer never
+    leaks into the displayed answer.
+    """
+    nl = _footer_start(raw)
+    if nl == len(raw):
+        return raw.strip(), []
 
-    return clean, used
+    tail = raw.rstrip()
+    clean = tail[:nl].strip()
+    indices_str = tail[nl + 1 :].partition(":")[2]
+    n = len(all_sources)
+    # 1-based citations → 0-based indices, dropping anything out of range
+    indices = (int(part) - 1 for part in indices_str.replace(",", " ").split() if part.isdigit())
+    return clean, [all_sources[idx] for idx in indices if 0 <= idx < n]
@@ -0,0 +1,96 @@
+"""Two-tier cache for final LLM answers, backed by Redis.
+
+The first tier is an exact match on the full request (see `cache_key.llm_key`)
+and needs no embedding. It is only used at temperature 0, where the answer is
+a function of the request rather than one random sample. Semantic entries are
+bucketed by a hash of everything the model saw except the question itself
+(system prompt, history, retrieved news). Within a bucket a cached answer is
+reused when the new question's embedding has cosine similarity >= `threshold`
+with a stored one — so "top scorers?" and "who's top scorer?" share one
+completion, but only against the same context.
+"""
+
+import logging
+
+import numpy as np
+import redis.asyncio as redis
+
+from app.rag.cache_key import canonical_hash
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "llmcache:"
+_EXACT_PREFIX = "llmcache:exact:"
+_MAX_ENTRIES_PER_CONTEXT = 32
+
+
+class SemanticLLMCache:
+    def __init__(self, redis_url: str, threshold: float = 0.9, ttl_seconds: int = 300) -> None:
+        self._redis = redis.from_url(redis_url)
+        self.threshold = threshold
+        self._ttl = ttl_seconds
+        self.stats = {"exact_hits": 0, "hits": 0, "misses": 0}
+
+    @staticmethod
+    def context_hash(prefix_messages: list[dict], context: str) -> str:
+        return canonical_hash([prefix_messages, context])
+
+    async def lookup_exact(self, request_key: str) -> str | None:
+        """Return the answer cached for this exact request, if any."""
+        try:
+            answer = await self._redis.get(_EXACT_PREFIX + request_key)
+        except Exception as exc:
+            logger.warning("LLM cache exact lookup failed: %s", exc)
+            return None
+        if answer is None:
+            return None
+        self.stats["exact_hits"] += 1
+        logger.info("LLM cache exact hit (%s)", self.stats)
+        return answer.decode("utf-8")
+
+    async def lookup(self, query_vector: list[float], context_hash: str) -> str | None:
+        """Return the cached answer for the closest question in this context, if close enough."""
+        try:
+            entries = await self._redis.lrange(_KEY_PREFIX + context_hash, 0, -1)
+        except Exception as exc:
+            logger.warning("LLM cache lookup failed: %s", exc)
+            return None
+
+        best_score, best_answer = -1.0, None
+        if entries:
+            qvec = np.asarray(query_vector, dtype=np.float32)
+            split = qvec.nbytes
+            vectors = np.stack([np.frombuffer(e[:split], dtype=np.float32) for e in entries])
+            scores = vectors @ qvec
+            best = int(np.argmax(scores))
+            best_score = float(scores[best])
+            if best_score >= self.threshold:
+                best_answer = entries[best][split:].decode("utf-8")
+
+        if best_answer is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        logger.info("LLM cache hit (cosine=%.3f, %s)", best_score, self.stats)
+        return best_answer
+
+    async def store(
+        self, request_key: str | None, query_vector: list[float], context_hash: str, answer: str
+    ) -> None:
+        # Entry layout: float32 embedding bytes followed by the UTF-8 answer
+        encoded = answer.encode("utf-8")
+        entry = np.asarray(query_vector, dtype=np.float32).tobytes() + encoded
+        key = _KEY_PREFIX + context_hash
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                if request_key is not None:
+                    pipe.set(_EXACT_PREFIX + request_key, encoded, ex=self._ttl)
+                pipe.lpush(key, entry)
+                pipe.ltrim(key, 0, _MAX_ENTRIES_PER_CONTEXT - 1)
+                pipe.expire(key, self._ttl)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("LLM cache store failed: %s", exc)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
@@ -1,8 +1,8 @@
-import json
 import logging
 from typing import AsyncGenerator
 
 import httpx
+import orjson
 from opentelemetry import trace
 from openinference.semconv.trace import MessageAttributes, SpanAttributes
 
@@ -11,6 +11,8 @@ from app.config import settings
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
+DEFAULT_MAX_TOKENS = 512
+
 
 class LLMClient:
     def __init__(self) -> None:
@@ -20,29 +22,38 @@ class LLMClient:
                 "Authorization": f"Bearer {settings.openai_api_key}",
                 "Content-Type": "application/json",
             },
-            timeout=30.0,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            # HTTP/2 multiplexes concurrent chat turns over one TLS connection.
+            # retries covers connection failures only — a POST that reached OpenAI is never replayed.
+            # (With an explicit transport, pool + protocol settings must live on the transport.)
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=2,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0),
+            ),
         )
         logger.info("LLM: OpenAI %s", settings.openai_model)
 
     async def complete(
         self,
         messages: list[dict],
-        tools: list[dict] | None = None,
-        max_tokens: int = 512,
+        tools: list[dict] | orjson.Fragment | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
     ) -> tuple[dict, str]:
         """Call chat completions and return (message_dict, finish_reason).
 
         The message_dict is the raw OpenAI message object — it may contain
         `content` (str | None) and/or `tool_calls` (list | None) depending
-        on `finish_reason` ("stop" vs "tool_calls").
+        on `finish_reason` ("stop" vs "tool_calls"). `tools` may be a
+        pre-encoded orjson.Fragment, which is embedded in the body as-is.
         """
         body: dict = {
             "model": settings.openai_model,
             "messages": messages,
             "max_tokens": max_tokens,
-            "temperature": 0.9,
+            "temperature": settings.llm_temperature,
         }
-        if tools:
+        if tools is not None:
             body["tools"] = tools
 
         with tracer.start_as_current_span("llm.complete") as span:
@@ -50,7 +61,7 @@ class LLMClient:
             span.set_attribute(SpanAttributes.LLM_MODEL_NAME, settings.openai_model)
             span.set_attribute(
                 SpanAttributes.LLM_INVOCATION_PARAMETERS,
-                json.dumps({"temperature": 0.9, "max_tokens": max_tokens}),
+                orjson.dumps({"temperature": settings.llm_temperature, "max_tokens": max_tokens}).decode(),
             )
 
             # Record input messages
@@ -61,9 +72,10 @@ class LLMClient:
                 if content:
                     span.set_attribute(f"{prefix}.{MessageAttributes.MESSAGE_CONTENT}", content)
 
-            response = await self._client.post("/v1/chat/completions", json=body)
+            # Content-Type is set on the client; orjson keeps the growing message list cheap to encode
+            response = await self._client.post("/v1/chat/completions", content=orjson.dumps(body))
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             choice = data["choices"][0]
             out = choice["message"]
 
@@ -87,20 +99,30 @@ class LLMClient:
 
             return out, choice["finish_reason"]
 
-    async def stream_complete(
+    async def stream(
         self,
         messages: list[dict],
-        max_tokens: int = 512,
-    ) -> AsyncGenerator[str, None]:
-        """Stream chat completions, yielding text chunks as they arrive."""
-        body = {
+        tools: list[dict] | orjson.Fragment | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+    ) -> AsyncGenerator[dict, None]:
+        """Stream chat completions, yielding each raw SSE chunk dict as it arrives.
+
+        The final chunk has empty `choices` and carries `usage`.
+        """
+        body: dict = {
             "model": settings.openai_model,
             "messages": messages,
             "max_tokens": max_tokens,
-            "temperature": 0.9,
+            "temperature": settings.llm_temperature,
             "stream": True,
+            "stream_options": {"include_usage": True},
         }
-        async with self._client.stream("POST", "/v1/chat/completions", json=body) as response:
+        if tools is not None:
+            body["tools"] = tools
+
+        async with self._client.stream(
+            "POST", "/v1/chat/completions", content=orjson.dumps(body)
+        ) as response:
             response.raise_for_status()
             async for line in response.aiter_lines():
                 if not line.startswith("data: "):
@@ -109,14 +131,32 @@ class LLMClient:
                 if payload.strip() == "[DONE]":
                     break
                 try:
-                    chunk = json.loads(payload)
-                    content = chunk["choices"][0]["delta"].get("content")
+                    yield orjson.loads(payload)
+                except orjson.JSONDecodeError:
+                    continue
+
+    async def stream_complete(
+        self,
+        messages: list[dict],
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+    ) -> AsyncGenerator[str, None]:
+        """Stream chat completions, yielding text chunks as they arrive."""
+        with tracer.start_as_current_span("llm.stream") as span:
+            span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "LLM")
+            span.set_attribute(SpanAttributes.LLM_MODEL_NAME, settings.openai_model)
+            async for chunk in self.stream(messages, max_tokens=max_tokens):
+                choices = chunk.get("choices")
+                if choices:
+                    content = choices[0].get("delta", {}).get("content")
                     if content:
                         yield content
-                except (json.JSONDecodeError, KeyError, IndexError):
-                    continue
+                usage = chunk.get("usage")
+                if usage:
+                    span.set_attribute(SpanAttributes.LLM_TOKEN_COUNT_PROMPT, usage.get("prompt_tokens", 0))
+                    span.set_attribute(SpanAttributes.LLM_TOKEN_COUNT_COMPLETION, usage.get("completion_tokens", 0))
+                    span.set_attribute(SpanAttributes.LLM_TOKEN_COUNT_TOTAL, usage.get("total_tokens", 0))
 
-    async def generate(self, messages: list[dict], max_tokens: int = 512) -> str:
+    async def generate(self, messages: list[dict], max_tokens: int = DEFAULT_MAX_TOKENS) -> str:
         """Convenience wrapper — returns content string only (no tool support)."""
         msg, _ = await self.complete(messages, max_tokens=max_tokens)
         return (msg.get("content") or "").strip()
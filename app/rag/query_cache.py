@@ -0,0 +1,72 @@
+"""Semantic cache of first-turn chat answers, keyed by query embedding.
+
+Near-duplicate opening questions ("who's top of the league?" / "who is top
+of the table?") are common. Embeddings are L2-normalized, so a flat
+inner-product scan over a few hundred cached vectors is a cosine lookup that
+costs microseconds — cheaper than retrieval, let alone an LLM round-trip.
+"""
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    vector: np.ndarray
+    result: dict
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class QueryCache:
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        ttl_seconds: int = 600,
+        max_entries: int = 256,
+    ) -> None:
+        self.threshold = threshold
+        self._ttl = ttl_seconds
+        self._entries: deque[_Entry] = deque(maxlen=max_entries)
+        self._matrix: np.ndarray | None = None  # stacked vectors, rebuilt lazily
+        self.stats = {"hits": 0, "misses": 0}
+
+    def lookup(self, vector: list[float]) -> dict | None:
+        """Return the cached result for the most similar query, or None below threshold."""
+        self._evict_expired()
+        if not self._entries:
+            self.stats["misses"] += 1
+            return None
+
+        if self._matrix is None:
+            self._matrix = np.stack([e.vector for e in self._entries])
+        scores = self._matrix @ np.asarray(vector, dtype=np.float32)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        logger.info("Query cache hit (cosine=%.3f, %s)", scores[best], self.stats)
+        return self._entries[best].result
+
+    def store(self, vector: list[float], result: dict) -> None:
+        if self._entries.maxlen == 0:
+            return
+        self._entries.append(_Entry(vector=np.asarray(vector, dtype=np.float32), result=result))
+        self._matrix = None
+
+    def _evict_expired(self) -> None:
+        # Entries share one TTL, so the oldest are always at the left
+        cutoff = time.monotonic() - self._ttl
+        evicted = False
+        while self._entries and self._entries[0].created_at < cutoff:
+            self._entries.popleft()
+            evicted = True
+        if evicted:
+            self._matrix = None
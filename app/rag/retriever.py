@@ -1,4 +1,7 @@
+import asyncio
 import logging
+from dataclasses import dataclass
+from datetime import datetime
 
 import weaviate.classes as wvc
 
@@ -9,35 +12,28 @@ from app.ingestion.embedder import Embedder
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
 class SourceDoc:
-    def __init__(
-        self,
-        title: str,
-        url: str,
-        summary: str,
-        published: str | None,
-        source: str,
-        score: float,
-    ) -> None:
-        self.title = title
-        self.url = url
-        self.summary = summary
-        self.published = published
-        self.source = source
-        self.score = score
+    title: str
+    url: str
+    summary: str
+    published: datetime | None
+    source: str
+    score: float
 
 
 class Retriever:
     def __init__(self, embedder: Embedder) -> None:
         self.embedder = embedder
 
-    def search(self, query: str, top_k: int | None = None) -> list[SourceDoc]:
+    async def search(self, query: str, top_k: int | None = None) -> list[SourceDoc]:
         k = top_k or settings.max_context_docs
-        query_vector = self.embedder.encode_query(query)
+        # Embedding is CPU-bound; the Weaviate round-trip below is native async
+        query_vector = await asyncio.to_thread(self.embedder.encode_query, query)
 
         try:
-            collection = weaviate_manager.client.collections.get(settings.collection_name)
-            results = collection.query.near_vector(
+            collection = weaviate_manager.async_client.collections.get(settings.collection_name)
+            results = await collection.query.near_vector(
                 near_vector=query_vector,
                 limit=k,
                 return_metadata=wvc.query.MetadataQuery(certainty=True),
@@ -47,28 +43,15 @@ class Retriever:
             logger.error("Weaviate search failed: %s", exc)
             return []
 
-        docs: list[SourceDoc] = []
-        for obj in results.objects:
-            p = obj.properties
-            score = obj.metadata.certainty if obj.metadata and obj.metadata.certainty else 0.0
-            docs.append(
-                SourceDoc(
-                    title=p.get("title", ""),
-                    url=p.get("url", ""),
-                    summary=p.get("summary", ""),
-                    published=p.get("published"),
-                    source=p.get("source", ""),
-                    score=round(score, 4),
-                )
-            )
+        docs = [_to_source_doc(obj.properties, obj.metadata) for obj in results.objects]
 
         logger.debug("Retrieved %d docs for query: %.60s...", len(docs), query)
         return docs
 
-    def search_with_context(
+    async def search_with_context(
         self, query: str, top_k: int | None = None
     ) -> tuple[str, list[SourceDoc]]:
-        docs = self.search(query, top_k)
+        docs = await self.search(query, top_k)
 
         if not docs:
             return "No relevant articles found in the knowledge base.", docs
@@ -83,3 +66,16 @@ class Retriever:
 
         context = "\n\n".join(parts)
         return context, docs
+
+
+def _to_source_doc(props: dict, meta) -> SourceDoc:
+    score = meta.certainty if meta and meta.certainty else 0.0
+    # Positional, in field order — one call per hit on the chat hot path
+    return SourceDoc(
+        props.get("title", ""),
+        props.get("url", ""),
+        props.get("summary", ""),
+        props.get("published"),
+        props.get("source", ""),
+        round(score, 4),
+    )
@@ -1,11 +1,16 @@
 import asyncio
+import functools
+import hashlib
 import logging
 import time
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta, timezone
-from typing import Awaitable, Callable
+from datetime import date, datetime, timedelta, timezone
+from operator import itemgetter
+from typing import Callable
 
 import httpx
+import ijson
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -16,157 +21,142 @@ _BASE_URL = "https://api.football-data.org/v4"
 class _Cache:
     content: str
     fetched_at: float = field(default_factory=time.time)
+    # Validators for the conditional GET on refresh, tied to the params they were issued for
+    params: dict | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    body_sig: bytes | None = None  # blake2b of the raw body `content` was formatted from
 
 
 class FootballDataClient:
     """Fetches live EPL stats from football-data.org (free tier).
 
-    Uses 4 concurrent requests per refresh (standings, recent results,
-    top scorers, upcoming fixtures). Results are cached for `cache_ttl_seconds`
-    (default 10 min) so we stay well within the 10 req/min free-tier limit.
+    One method per stats block (standings, recent results, top scorers,
+    upcoming fixtures), each called by the agent's tool dispatcher. Results
+    are cached for `cache_ttl_seconds` (default 10 min) so we stay well
+    within the 10 req/min free-tier limit.
     """
 
     def __init__(self, api_key: str, cache_ttl_seconds: int = 600) -> None:
         self._ttl = cache_ttl_seconds
-        self._cache: _Cache | None = None
         self._caches: dict[str, _Cache] = {}  # per-method caches
+        self._inflight: dict[str, asyncio.Task[str]] = {}  # refreshes in progress, by cache key
         self._client = httpx.AsyncClient(
             base_url=_BASE_URL,
             headers={"X-Auth-Token": api_key},
             timeout=10.0,
+            # The 4 concurrent stats calls multiplex over one HTTP/2 connection; keepalive
+            # spans the cache window so the next refresh skips the TLS handshake
+            http2=True,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=2, keepalive_expiry=600.0),
         )
 
-    async def get_formatted_stats(self) -> str | None:
-        """Return a formatted stats string, using cache when fresh.
-
-        Returns None on failure so the caller degrades gracefully.
-        """
-        now = time.time()
-        if self._cache and (now - self._cache.fetched_at) < self._ttl:
-            return self._cache.content
-
-        try:
-            content = await self._fetch_and_format()
-            self._cache = _Cache(content=content)
-            return content
-        except Exception as exc:
-            logger.warning("Live stats fetch failed: %s", exc)
-            return self._cache.content if self._cache else None
-
-    async def _fetch_and_format(self) -> str:
-        today = datetime.now(timezone.utc).date()
-        two_weeks_ago = (today - timedelta(days=14)).isoformat()
-        three_weeks_ahead = (today + timedelta(days=21)).isoformat()
-
-        (
-            standings_resp,
-            results_resp,
-            scorers_resp,
-            fixtures_resp,
-        ) = await asyncio.gather(
-            self._client.get("/competitions/PL/standings"),
-            self._client.get(
-                "/competitions/PL/matches",
-                params={"status": "FINISHED", "dateFrom": two_weeks_ago, "dateTo": today.isoformat()},
-            ),
-            self._client.get("/competitions/PL/scorers", params={"limit": 15}),
-            self._client.get(
-                "/competitions/PL/matches",
-                params={"status": "SCHEDULED", "dateFrom": today.isoformat(), "dateTo": three_weeks_ahead},
-            ),
-            return_exceptions=True,
-        )
-
-        parts: list[str] = []
-
-        if isinstance(standings_resp, Exception):
-            logger.warning("Standings request error: %s", standings_resp)
-        else:
-            standings_resp.raise_for_status()
-            formatted = _format_standings(standings_resp.json())
-            if formatted:
-                parts.append(formatted)
-
-        if isinstance(scorers_resp, Exception):
-            logger.warning("Scorers request error: %s", scorers_resp)
-        else:
-            scorers_resp.raise_for_status()
-            formatted = _format_top_scorers(scorers_resp.json())
-            if formatted:
-                parts.append(formatted)
-
-        if isinstance(results_resp, Exception):
-            logger.warning("Results request error: %s", results_resp)
-        else:
-            results_resp.raise_for_status()
-            formatted = _format_recent_results(results_resp.json())
-            if formatted:
-                parts.append(formatted)
-
-        if isinstance(fixtures_resp, Exception):
-            logger.warning("Fixtures request error: %s", fixtures_resp)
-        else:
-            fixtures_resp.raise_for_status()
-            formatted = _format_upcoming_fixtures(fixtures_resp.json())
-            if formatted:
-                parts.append(formatted)
-
-        if not parts:
-            raise RuntimeError("No stats data returned from football-data.org")
-
-        return "\n\n".join(parts)
-
     # ── Individual callable methods (used by the agentic tool dispatcher) ──────
 
     async def get_standings(self) -> str:
-        async def fetch() -> str:
-            resp = await self._client.get("/competitions/PL/standings")
-            resp.raise_for_status()
-            return _format_standings(resp.json()) or "No standings data available."
-        return await self._cached("standings", fetch)
+        return await self._cached(
+            "standings",
+            "/competitions/PL/standings",
+            lambda body: _format_standings(body) or "No standings data available.",
+        )
 
     async def get_top_scorers(self, limit: int = 10) -> str:
         limit = min(max(limit, 1), 20)
-        async def fetch() -> str:
-            resp = await self._client.get("/competitions/PL/scorers", params={"limit": limit})
-            resp.raise_for_status()
-            return _format_top_scorers(resp.json()) or "No scorers data available."
-        return await self._cached(f"scorers_{limit}", fetch)
+        return await self._cached(
+            f"scorers_{limit}",
+            "/competitions/PL/scorers",
+            lambda body: _format_top_scorers(orjson.loads(body)) or "No scorers data available.",
+            params={"limit": limit},
+        )
 
     async def get_recent_results(self, days: int = 14) -> str:
         days = min(max(days, 1), 30)
-        async def fetch() -> str:
-            today = datetime.now(timezone.utc).date()
-            date_from = (today - timedelta(days=days)).isoformat()
-            resp = await self._client.get(
-                "/competitions/PL/matches",
-                params={"status": "FINISHED", "dateFrom": date_from, "dateTo": today.isoformat()},
-            )
-            resp.raise_for_status()
-            return _format_recent_results(resp.json(), days=days) or f"No results found in the last {days} days."
-        return await self._cached(f"results_{days}", fetch)
+        today = _today_utc(int(time.time()) // 60)
+        return await self._cached(
+            f"results_{days}",
+            "/competitions/PL/matches",
+            lambda body: _format_recent_results(orjson.loads(body), days=days)
+            or f"No results found in the last {days} days.",
+            params={"status": "FINISHED", "dateFrom": _iso_offset(today, -days), "dateTo": _iso_offset(today, 0)},
+        )
 
     async def get_upcoming_fixtures(self, days: int = 21) -> str:
         days = min(max(days, 1), 60)
-        async def fetch() -> str:
-            today = datetime.now(timezone.utc).date()
-            date_to = (today + timedelta(days=days)).isoformat()
-            resp = await self._client.get(
-                "/competitions/PL/matches",
-                params={"status": "SCHEDULED", "dateFrom": today.isoformat(), "dateTo": date_to},
-            )
-            resp.raise_for_status()
-            return _format_upcoming_fixtures(resp.json(), days=days) or f"No fixtures found in the next {days} days."
-        return await self._cached(f"fixtures_{days}", fetch)
+        today = _today_utc(int(time.time()) // 60)
+        return await self._cached(
+            f"fixtures_{days}",
+            "/competitions/PL/matches",
+            lambda body: _format_upcoming_fixtures(orjson.loads(body), days=days)
+            or f"No fixtures found in the next {days} days.",
+            params={"status": "SCHEDULED", "dateFrom": _iso_offset(today, 0), "dateTo": _iso_offset(today, days)},
+        )
 
-    async def _cached(self, key: str, fetcher: Callable[[], Awaitable[str]]) -> str:
-        now = time.time()
+    async def _cached(
+        self,
+        key: str,
+        path: str,
+        format_body: Callable[[bytes], str],
+        params: dict | None = None,
+    ) -> str:
+        """Return the formatted response for `path`, refetching once the TTL lapses.
+
+        Refreshes are conditional GETs: a 304 keeps the cached content and
+        restarts its TTL without a body transfer or re-format. On failure the
+        last good content is served if there is one.
+        """
         cached = self._caches.get(key)
-        if cached and (now - cached.fetched_at) < self._ttl:
+        if cached and (time.time() - cached.fetched_at) < self._ttl:
+            logger.debug("Stats cache hit: %s", key)
             return cached.content
+
+        # Single-flight: concurrent misses on one key share a single refresh, so a
+        # burst of tool calls right after expiry costs one request, not N.
+        # shield() keeps one caller's cancellation from cancelling the others.
+        refresh = self._inflight.get(key)
+        if refresh is None:
+            refresh = asyncio.create_task(self._refresh(key, cached, path, format_body, params))
+            self._inflight[key] = refresh
+            refresh.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(refresh)
+
+    async def _refresh(
+        self,
+        key: str,
+        cached: _Cache | None,
+        path: str,
+        format_body: Callable[[bytes], str],
+        params: dict | None,
+    ) -> str:
+        now = time.time()
+        headers: dict[str, str] = {}
+        # Date-windowed queries roll over daily — old validators belong to another URL
+        if cached and cached.params == params:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
         try:
-            content = await fetcher()
-            self._caches[key] = _Cache(content=content)
+            resp = await self._client.get(path, params=params, headers=headers)
+            if resp.status_code == 304 and cached:
+                logger.debug("Stats not modified: %s", key)
+                cached.fetched_at = now
+                return cached.content
+            resp.raise_for_status()
+            # A 200 with an unchanged body (no validators, or a rolled-over date
+            # window) reuses the formatted text — hashing is far cheaper than parse + format
+            body_sig = hashlib.blake2b(resp.content, digest_size=16).digest()
+            if cached and cached.body_sig == body_sig:
+                content = cached.content
+            else:
+                content = format_body(resp.content)
+            self._caches[key] = _Cache(
+                content=content,
+                params=params,
+                etag=resp.headers.get("etag"),
+                last_modified=resp.headers.get("last-modified"),
+                body_sig=body_sig,
+            )
             return content
         except Exception as exc:
             logger.warning("Stats fetch failed for '%s': %s", key, exc)
@@ -178,35 +168,71 @@ class FootballDataClient:
         await self._client.aclose()
 
 
+@functools.lru_cache(maxsize=1)
+def _today_utc(minute_bucket: int) -> date:
+    # Keyed on the current minute, so the date is recomputed at most once a minute
+    return datetime.now(timezone.utc).date()
+
+
+@functools.lru_cache(maxsize=32)
+def _iso_offset(today: date, days: int) -> str:
+    return (today + timedelta(days=days)).isoformat()
+
+
+_DOW = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MON = ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_BY_DATE = itemgetter(0)  # match rows lead with utcDate; ISO-8601 strings sort chronologically
+
+# Row templates — bound .format methods, so each row is one C-level format call
+_TABLE_HEADER = f"{'Pos':<4} {'Team':<22} {'P':>2}  {'W':>2} {'D':>2} {'L':>2}  {'GF':>3} {'GA':>3} {'GD':>4}  {'Pts':>3}"
+_TABLE_RULE = "-" * 62
+_TABLE_ROW = "{:<4} {:<22} {:>2}  {:>2} {:>2} {:>2}  {:>3} {:>3} {:>4}  {:>3}".format
+_SCORER_ROW = "{:>2}. {} ({}) — {}G{}, {}A".format
+_RESULT_ROW = "{} {}–{} {}  ({}){}".format
+_FIXTURE_ROW = "{} vs {}  —  {}{}".format
+
+
 # ── Formatters ────────────────────────────────────────────────────────────────
 
-def _format_standings(data: dict) -> str:
+def _format_standings(content: bytes) -> str:
+    # The response carries TOTAL, HOME and AWAY tables; stream it and stop at
+    # TOTAL (listed first) instead of building all three. `season` precedes
+    # `standings` in the payload, so that lookup also stops early.
     try:
         table = next(
-            s for s in data["standings"] if s["type"] == "TOTAL"
+            s for s in ijson.items(content, "standings.item") if s["type"] == "TOTAL"
         )["table"]
-    except (KeyError, StopIteration):
+        # Without a `season` key this walks the whole body, so it shares the error handling
+        matchday = next(ijson.items(content, "season.currentMatchday"), None)
+    except (KeyError, StopIteration, ijson.JSONError):
         return ""
 
-    matchday = data.get("season", {}).get("currentMatchday", "?")
-    lines = [f"PREMIER LEAGUE TABLE (Matchday {matchday})"]
-    lines.append(f"{'Pos':<4} {'Team':<22} {'P':>2}  {'W':>2} {'D':>2} {'L':>2}  {'GF':>3} {'GA':>3} {'GD':>4}  {'Pts':>3}")
-    lines.append("-" * 62)
-    for row in table:
-        pos = row["position"]
-        team = row["team"].get("shortName") or row["team"]["name"]
-        pts = row["points"]
-        gd = row["goalDifference"]
-        gd_str = f"+{gd}" if gd > 0 else str(gd)
-        w, d, l_ = row["won"], row["draw"], row["lost"]
-        played = row["playedGames"]
-        gf = row.get("goalsFor", "-")
-        ga = row.get("goalsAgainst", "-")
-        lines.append(
-            f"{pos:<4} {team:<22} {played:>2}  {w:>2} {d:>2} {l_:>2}  {gf:>3} {ga:>3} {gd_str:>4}  {pts:>3}"
-        )
+    if matchday is None:
+        matchday = "?"
+    return "\n".join(
+        [
+            f"PREMIER LEAGUE TABLE (Matchday {matchday})",
+            _TABLE_HEADER,
+            _TABLE_RULE,
+            *map(_standings_row, table),
+        ]
+    )
+
 
-    return "\n".join(lines)
+def _standings_row(row: dict) -> str:
+    gd = row["goalDifference"]
+    return _TABLE_ROW(
+        row["position"],
+        _team_name(row["team"]),
+        row["playedGames"],
+        row["won"],
+        row["draw"],
+        row["lost"],
+        row.get("goalsFor", "-"),
+        row.get("goalsAgainst", "-"),
+        f"+{gd}" if gd > 0 else gd,
+        row["points"],
+    )
 
 
 def _format_top_scorers(data: dict) -> str:
@@ -215,19 +241,21 @@ def _format_top_scorers(data: dict) -> str:
         return ""
 
     matchday = data.get("season", {}).get("currentMatchday", "?")
-    lines = [f"TOP SCORERS (Matchday {matchday})"]
-    for i, s in enumerate(scorers, 1):
-        player = s["player"]["name"]
-        team = s["team"].get("shortName") or s["team"]["name"]
-        goals = s.get("goals") or 0
-        assists = s.get("assists") or 0
-        penalties = s.get("penalties") or 0
-        pen_note = f" ({penalties} pens)" if penalties else ""
-        lines.append(
-            f"{i:>2}. {player} ({team}) — {goals}G{pen_note}, {assists}A"
-        )
+    return "\n".join(
+        [f"TOP SCORERS (Matchday {matchday})", *map(_scorer_row, range(1, len(scorers) + 1), scorers)]
+    )
 
-    return "\n".join(lines)
+
+def _scorer_row(rank: int, s: dict) -> str:
+    penalties = s.get("penalties") or 0
+    return _SCORER_ROW(
+        rank,
+        s["player"]["name"],
+        _team_name(s["team"]),
+        s.get("goals") or 0,
+        f" ({penalties} pens)" if penalties else "",
+        s.get("assists") or 0,
+    )
 
 
 def _format_recent_results(data: dict, days: int = 14) -> str:
@@ -235,47 +263,76 @@ def _format_recent_results(data: dict, days: int = 14) -> str:
     if not matches:
         return ""
 
-    sorted_matches = sorted(
-        matches,
-        key=lambda m: m.get("utcDate", ""),
-        reverse=True,
+    # One pass pulls each match's fields into a flat row tuple led by utcDate, so
+    # the sort and the format loop never walk the nested dicts again. A missing
+    # date becomes "" — the row is kept and sorts/renders as it always did.
+    rows = [
+        (
+            m.get("utcDate", ""),
+            _team_name(m["homeTeam"]),
+            _team_name(m["awayTeam"]),
+            m.get("score", {}).get("fullTime", {}),
+            m.get("matchday", ""),
+        )
+        for m in matches
+    ]
+    rows.sort(key=_BY_DATE, reverse=True)
+
+    return "\n".join(
+        [
+            f"RECENT RESULTS (last {days} days)",
+            *(
+                _RESULT_ROW(
+                    home,
+                    score.get("home", "?"),
+                    score.get("away", "?"),
+                    away,
+                    utc[:10],
+                    f"  MD{matchday}" if matchday else "",
+                )
+                for utc, home, away, score, matchday in rows
+            ),
+        ]
     )
 
-    lines = [f"RECENT RESULTS (last {days} days)"]
-    for m in sorted_matches:
-        home = m["homeTeam"].get("shortName") or m["homeTeam"]["name"]
-        away = m["awayTeam"].get("shortName") or m["awayTeam"]["name"]
-        score = m.get("score", {}).get("fullTime", {})
-        hs = score.get("home", "?")
-        as_ = score.get("away", "?")
-        date = m.get("utcDate", "")[:10]
-        matchday = m.get("matchday", "")
-        md_note = f"  MD{matchday}" if matchday else ""
-        lines.append(f"{home} {hs}–{as_} {away}  ({date}){md_note}")
-
-    return "\n".join(lines)
-
 
 def _format_upcoming_fixtures(data: dict, days: int = 21) -> str:
     matches = data.get("matches", [])
     if not matches:
         return ""
 
-    sorted_matches = sorted(matches, key=lambda m: m.get("utcDate", ""))
+    rows = [
+        (m.get("utcDate", ""), _team_name(m["homeTeam"]), _team_name(m["awayTeam"]), m.get("matchday", ""))
+        for m in matches
+    ]
+    rows.sort(key=_BY_DATE)
+
+    return "\n".join(
+        [
+            f"UPCOMING FIXTURES (next {days} days)",
+            *(
+                _FIXTURE_ROW(home, away, _fixture_time(utc), f"  (MD{matchday})" if matchday else "")
+                for utc, home, away, matchday in rows
+            ),
+        ]
+    )
 
-    lines = [f"UPCOMING FIXTURES (next {days} days)"]
-    for m in sorted_matches:
-        home = m["homeTeam"].get("shortName") or m["homeTeam"]["name"]
-        away = m["awayTeam"].get("shortName") or m["awayTeam"]["name"]
-        utc = m.get("utcDate", "")
-        # Format: "2025-02-26T20:00:00Z" → "Wed 26 Feb, 20:00"
-        try:
-            dt = datetime.fromisoformat(utc.replace("Z", "+00:00"))
-            day_str = dt.strftime("%a %d %b, %H:%M UTC")
-        except Exception:
-            day_str = utc[:16].replace("T", " ") + " UTC"
-        matchday = m.get("matchday", "")
-        md_note = f"  (MD{matchday})" if matchday else ""
-        lines.append(f"{home} vs {away}  —  {day_str}{md_note}")
-
-    return "\n".join(lines)
+
+def _team_name(team: dict) -> str:
+    return team.get("shortName") or team["name"]
+
+
+def _fixture_time(utc: str) -> str:
+    """"2025-02-26T20:00:00Z" → "Wed 26 Feb, 20:00 UTC", sliced straight from the ISO string."""
+    try:
+        if len(utc) < 16:
+            raise ValueError("no time component")  # e.g. date-only "2025-02-26"
+        return f"{_DOW[_weekday(utc[:10])]} {utc[8:10]} {_MON[int(utc[5:7])]}, {utc[11:16]} UTC"
+    except ValueError:
+        return utc[:16].replace("T", " ") + " UTC"
+
+
+@functools.lru_cache(maxsize=64)
+def _weekday(ymd: str) -> int:
+    # Fixture windows span at most 60 days, so a handful of dates cover every row
+    return date.fromisoformat(ymd).weekday()
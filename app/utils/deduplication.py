@@ -1,7 +1,9 @@
+import hashlib
 import logging
+import uuid
 from typing import TYPE_CHECKING
 
-import weaviate.util
+from weaviate.classes.query import Filter
 
 from app.config import settings
 from app.db.weaviate_client import weaviate_manager
@@ -11,12 +13,24 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_WARM_PAGE_SIZE = 10_000  # Weaviate's default QUERY_MAXIMUM_RESULTS
+_NAMESPACE = uuid.NAMESPACE_DNS.bytes  # weaviate.util.generate_uuid5's default namespace
+
+
+def _uuid5_bytes(name: str) -> bytes:
+    """Raw bytes of the UUID weaviate.util.generate_uuid5(name) returns, without the UUID/str objects."""
+    digest = bytearray(hashlib.sha1(_NAMESPACE + name.encode()).digest()[:16])
+    digest[6] = (digest[6] & 0x0F) | 0x50  # version 5
+    digest[8] = (digest[8] & 0x3F) | 0x80  # RFC 4122 variant
+    return bytes(digest)
+
 
 class DeduplicationStore:
     """
     Two-layer deduplication:
     L1 — in-memory set of UUID5s seen this process lifetime (fast, zero round-trips)
-    L2 — Weaviate object existence check (cross-restart safety via deterministic UUID5)
+    L2 — Weaviate content_hash lookup for L1 misses, batched into one query per run
+         (cross-restart safety on top of the deterministic UUID5)
 
     Because Weaviate uses our deterministic UUID5 as the object ID, inserting a
     duplicate simply overwrites the existing object. The L1 cache lets us skip
@@ -24,26 +38,52 @@ class DeduplicationStore:
     """
 
     def __init__(self) -> None:
-        self._seen: set[str] = set()
+        # Raw 16-byte UUIDs — cheaper to hash and store than canonical strings
+        self._seen: set[bytes] = set()
 
     def warm_cache(self) -> None:
         """Load all existing object UUIDs from Weaviate into the in-memory set."""
         try:
             collection = weaviate_manager.client.collections.get(settings.collection_name)
-            count = 0
-            for item in collection.iterator(include_vector=False):
-                self._seen.add(str(item.uuid))
-                count += 1
+            before = len(self._seen)
+            # IDs only, in large cursor pages — properties were fetched and thrown away before
+            self._seen.update(
+                item.uuid.bytes
+                for item in collection.iterator(
+                    include_vector=False, return_properties=[], cache_size=_WARM_PAGE_SIZE
+                )
+            )
+            count = len(self._seen) - before
             logger.info("Dedup cache warmed with %d existing UUIDs", count)
         except Exception as exc:
             logger.warning("Could not warm dedup cache: %s", exc)
 
     def filter_new(self, articles: list["Article"]) -> list["Article"]:
         """Return only articles whose UUID5 is not already known."""
-        new: list["Article"] = []
-        for article in articles:
-            uuid = str(weaviate.util.generate_uuid5(article.content_hash))
-            if uuid not in self._seen:
-                new.append(article)
-                self._seen.add(uuid)
-        return new
+        keys = [_uuid5_bytes(a.content_hash) for a in articles]
+        # dict.fromkeys drops in-batch repeats in first-seen order; the reversed
+        # zip maps each key back to its first article
+        new_keys = [k for k in dict.fromkeys(keys) if k not in self._seen]
+        first = dict(zip(reversed(keys), reversed(articles)))
+        candidates = [first[k] for k in new_keys]
+        self._seen.update(new_keys)
+
+        stored = self._stored_hashes([a.content_hash for a in candidates])
+        return [a for a in candidates if a.content_hash not in stored]
+
+    def _stored_hashes(self, hashes: list[str]) -> set[str]:
+        """Return the subset of `hashes` already in Weaviate — one round-trip for the whole batch."""
+        if not hashes:
+            return set()
+        try:
+            collection = weaviate_manager.client.collections.get(settings.collection_name)
+            response = collection.query.fetch_objects(
+                filters=Filter.by_property("content_hash").contains_any(hashes),
+                return_properties=["content_hash"],
+                limit=len(hashes),
+            )
+        except Exception as exc:
+            # Upserts are idempotent (UUID5), so treating everything as new is safe
+            logger.warning("Dedup L2 lookup failed for %d articles: %s", len(hashes), exc)
+            return set()
+        return {obj.properties["content_hash"] for obj in response.objects}